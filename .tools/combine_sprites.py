@@ -1,7 +1,7 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.14"
-# dependencies = ["pillow"]
+# dependencies = ["numpy", "pillow"]
 # ///
 """
 Combine individual PNG sprite frames into sprite sheets.
@@ -19,9 +19,24 @@ Sprite sheet layout (rows):
 Each row has max_frames columns (determined by longest animation).
 """
 
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, lru_cache
 from pathlib import Path
+from typing import TypedDict
+
+import numpy as np
+import numpy.typing as npt
 from PIL import Image
-import json
+
+type Pixels = npt.NDArray[np.uint8]  # (h, w, 4) RGBA
 
 
 # Animation name mapping: game state -> pixellab directory name
@@ -67,14 +82,100 @@ ENEMY_ANIM_ORDER: dict[str, list[tuple[str, str]]] = {
 DIRECTIONS: list[str] = ["south", "west", "east", "north"]
 FRAME_SIZE: int = 64  # Pixels
 
+# zlib level for saved sheets: default for committed output, --fast for local dev
+PNG_COMPRESS_LEVEL: int = 6
+PNG_FAST_COMPRESS_LEVEL: int = 1
+
+# Per-sheet input hashes from the previous run, stored next to the sheets
+SHEET_CACHE_NAME: str = ".cache.json"
+
+
+class AnimMeta(TypedDict):
+    row: int
+    frames: int
+    source: str
+
 
-def get_frame_files(anim_dir: Path, direction: str) -> list[Path]:
-    """Get sorted frame files for an animation direction."""
+class SheetCacheEntry(TypedDict):
+    key: str
+    animations: dict[str, AnimMeta]
+
+
+type SheetCache = dict[str, SheetCacheEntry]  # sheet file name -> entry
+
+
+@cache
+def get_frame_files(anim_dir: Path, direction: str) -> tuple[Path, ...]:
+    """Get sorted frame files for an animation direction.
+
+    Cached: count_max_frames and create_sprite_sheet query the same
+    directories, so each one is only scanned once per run.
+    """
     dir_path = anim_dir / direction
-    if not dir_path.exists():
-        return []
-    frames = sorted(dir_path.glob("frame_*.png"))
-    return frames
+    try:
+        with os.scandir(dir_path) as it:
+            names = [
+                e.name
+                for e in it
+                if e.name.startswith("frame_") and e.name.endswith(".png") and e.is_file()
+            ]
+    except FileNotFoundError:
+        return ()
+    names.sort()
+    return tuple(dir_path / n for n in names)
+
+
+@lru_cache(maxsize=512)
+def load_frame(frame_path: Path) -> Pixels:
+    """Decode a frame to an RGBA array once; reused frames hit the cache."""
+    with Image.open(frame_path) as im:
+        # PixelLab frames are already RGBA; converting those would just copy.
+        frame = np.asarray(im if im.mode == "RGBA" else im.convert("RGBA"))
+    frame.flags.writeable = False
+    return frame
+
+
+def blit_frame(sheet: Pixels, frame: Pixels, x: int, y: int) -> None:
+    """Copy a frame into the sheet at (x, y), clipped to the sheet bounds."""
+    h, w = frame.shape[:2]
+    dst = sheet[y : y + h, x : x + w]
+    dst[...] = frame[: dst.shape[0], : dst.shape[1]]
+
+
+def sheet_inputs_key(
+    anims_dir: Path,
+    rows: list[tuple[str, str]],
+    direction: str,
+    max_frames: int,
+    compress_level: int,
+) -> str:
+    """Hash everything that feeds one sheet: layout, frame list, and frame stats."""
+    key = hashlib.blake2b(digest_size=16)
+    key.update(f"{FRAME_SIZE}:{max_frames}:{compress_level}".encode())
+    for state_name, pixellab_name in rows:
+        key.update(f"\0{state_name}={pixellab_name}".encode())
+        if not pixellab_name:
+            continue
+        for frame_path in get_frame_files(anims_dir / pixellab_name, direction):
+            st = frame_path.stat()
+            key.update(f"\0{frame_path.name}:{st.st_mtime_ns}:{st.st_size}".encode())
+    return key.hexdigest()
+
+
+def load_sheet_cache(output_dir: Path) -> SheetCache:
+    """Read the previous run's sheet cache; a missing or corrupt file is empty."""
+    try:
+        sheet_cache = json.loads((output_dir / SHEET_CACHE_NAME).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(sheet_cache, dict) or not all(
+        isinstance(entry, dict)
+        and isinstance(entry.get("key"), str)
+        and isinstance(entry.get("animations"), dict)
+        for entry in sheet_cache.values()
+    ):
+        return {}
+    return sheet_cache
 
 
 def count_max_frames(char_dir: Path, char_name: str) -> int:
@@ -102,18 +203,18 @@ def count_max_frames(char_dir: Path, char_name: str) -> int:
 
 def create_sprite_sheet(
     char_dir: Path, char_name: str, direction: str, max_frames: int
-) -> tuple[Image.Image, dict[str, dict[str, int]]]:
+) -> tuple[Image.Image, dict[str, AnimMeta]]:
     """Create sprite sheet for one character and direction."""
     num_rows = len(ANIM_ORDER)
     sheet_width = max_frames * FRAME_SIZE
     sheet_height = num_rows * FRAME_SIZE
 
     # Create RGBA sheet with transparent background
-    sheet = Image.new("RGBA", (sheet_width, sheet_height), (0, 0, 0, 0))
+    sheet: Pixels = np.zeros((sheet_height, sheet_width, 4), dtype=np.uint8)
     anims_dir = char_dir / "animations"
 
     # Metadata for TOML config generation
-    anim_metadata: dict[str, dict[str, int]] = {}
+    anim_metadata: dict[str, AnimMeta] = {}
 
     for row, (state_name, pixellab_name) in enumerate(ANIM_ORDER):
         if pixellab_name is None:
@@ -130,10 +231,10 @@ def create_sprite_sheet(
 
         # Paste frames into sheet
         for col, frame_path in enumerate(frames):
-            frame = Image.open(frame_path)
+            frame = load_frame(frame_path)
             x = col * FRAME_SIZE
             y = row * FRAME_SIZE
-            sheet.paste(frame, (x, y))
+            blit_frame(sheet, frame, x, y)
 
         # Store metadata
         anim_metadata[state_name] = {
@@ -142,11 +243,20 @@ def create_sprite_sheet(
             "source": pixellab_name,
         }
 
-    return sheet, anim_metadata
+    return Image.fromarray(sheet), anim_metadata
+
 
+def process_character(
+    char_dir: Path,
+    output_dir: Path,
+    compress_level: int = PNG_COMPRESS_LEVEL,
+    sheet_cache: SheetCache | None = None,
+) -> tuple[dict[str, object], SheetCache]:
+    """Process all directions for one character.
 
-def process_character(char_dir: Path, output_dir: Path) -> dict[str, object]:
-    """Process all directions for one character."""
+    Sheets whose inputs match their `sheet_cache` entry (and still exist) are
+    not rebuilt. Returns the metadata plus this character's fresh cache entries.
+    """
     char_name = char_dir.name
     print(f"Processing {char_name}...")
 
@@ -160,21 +270,36 @@ def process_character(char_dir: Path, output_dir: Path) -> dict[str, object]:
         "directions": {},
     }
 
-    for direction in DIRECTIONS:
-        print(f"  Creating {direction} sheet...")
-        sheet, anim_meta = create_sprite_sheet(char_dir, char_name, direction, max_frames)
+    anims_dir = char_dir / "animations"
+    rows = [
+        (state_name, pixellab_name or SPECIAL_ANIMS.get(char_name, ""))
+        for state_name, pixellab_name in ANIM_ORDER
+    ]
+    entries: SheetCache = {}
 
-        # Save PNG
+    for direction in DIRECTIONS:
         out_path = output_dir / f"{char_name}_{direction}.png"
-        sheet.save(out_path, "PNG")
-        print(f"    Saved: {out_path}")
+        key = sheet_inputs_key(anims_dir, rows, direction, max_frames, compress_level)
+        cached = (sheet_cache or {}).get(out_path.name)
+
+        if cached is not None and cached["key"] == key and out_path.exists():
+            anim_meta = cached["animations"]
+            print(f"  Unchanged: {out_path}")
+        else:
+            print(f"  Creating {direction} sheet...")
+            sheet, anim_meta = create_sprite_sheet(char_dir, char_name, direction, max_frames)
 
+            # Save PNG
+            sheet.save(out_path, "PNG", compress_level=compress_level)
+            print(f"    Saved: {out_path}")
+
+        entries[out_path.name] = {"key": key, "animations": anim_meta}
         all_metadata["directions"][direction] = {
             "sheet": str(out_path.relative_to(output_dir.parent.parent)),
             "animations": anim_meta,
         }
 
-    return all_metadata
+    return all_metadata, entries
 
 
 def count_enemy_max_frames(enemy_dir: Path, enemy_name: str) -> int:
@@ -199,16 +324,16 @@ def count_enemy_max_frames(enemy_dir: Path, enemy_name: str) -> int:
 
 def create_enemy_sprite_sheet(
     enemy_dir: Path, enemy_name: str, direction: str, max_frames: int
-) -> tuple[Image.Image, dict[str, dict[str, int]]]:
+) -> tuple[Image.Image, dict[str, AnimMeta]]:
     """Create sprite sheet for one enemy and direction."""
     anim_order = ENEMY_ANIM_ORDER.get(enemy_name, [])
     num_rows = len(anim_order)
     sheet_width = max_frames * FRAME_SIZE
     sheet_height = num_rows * FRAME_SIZE
 
-    sheet = Image.new("RGBA", (sheet_width, sheet_height), (0, 0, 0, 0))
+    sheet: Pixels = np.zeros((sheet_height, sheet_width, 4), dtype=np.uint8)
     anims_dir = enemy_dir / "animations"
-    anim_metadata: dict[str, dict[str, int]] = {}
+    anim_metadata: dict[str, AnimMeta] = {}
 
     for row, (state_name, pixellab_name) in enumerate(anim_order):
         if not pixellab_name:
@@ -222,10 +347,10 @@ def create_enemy_sprite_sheet(
             continue
 
         for col, frame_path in enumerate(frames):
-            frame = Image.open(frame_path)
+            frame = load_frame(frame_path)
             x = col * FRAME_SIZE
             y = row * FRAME_SIZE
-            sheet.paste(frame, (x, y))
+            blit_frame(sheet, frame, x, y)
 
         anim_metadata[state_name] = {
             "row": row,
@@ -233,11 +358,16 @@ def create_enemy_sprite_sheet(
             "source": pixellab_name,
         }
 
-    return sheet, anim_metadata
+    return Image.fromarray(sheet), anim_metadata
 
 
-def process_enemy(enemy_dir: Path, output_dir: Path) -> dict[str, object]:
-    """Process all directions for one enemy."""
+def process_enemy(
+    enemy_dir: Path,
+    output_dir: Path,
+    compress_level: int = PNG_COMPRESS_LEVEL,
+    sheet_cache: SheetCache | None = None,
+) -> tuple[dict[str, object], SheetCache]:
+    """Process all directions for one enemy (same caching as process_character)."""
     enemy_name = enemy_dir.name
     print(f"Processing enemy: {enemy_name}...")
 
@@ -251,26 +381,78 @@ def process_enemy(enemy_dir: Path, output_dir: Path) -> dict[str, object]:
         "directions": {},
     }
 
-    for direction in DIRECTIONS:
-        print(f"  Creating {direction} sheet...")
-        sheet, anim_meta = create_enemy_sprite_sheet(
-            enemy_dir, enemy_name, direction, max_frames
-        )
+    anims_dir = enemy_dir / "animations"
+    rows = ENEMY_ANIM_ORDER.get(enemy_name, [])
+    entries: SheetCache = {}
 
+    for direction in DIRECTIONS:
         out_path = output_dir / f"{enemy_name}_{direction}.png"
-        sheet.save(out_path, "PNG")
-        print(f"    Saved: {out_path}")
-
+        key = sheet_inputs_key(anims_dir, rows, direction, max_frames, compress_level)
+        cached = (sheet_cache or {}).get(out_path.name)
+
+        if cached is not None and cached["key"] == key and out_path.exists():
+            anim_meta = cached["animations"]
+            print(f"  Unchanged: {out_path}")
+        else:
+            print(f"  Creating {direction} sheet...")
+            sheet, anim_meta = create_enemy_sprite_sheet(
+                enemy_dir, enemy_name, direction, max_frames
+            )
+
+            sheet.save(out_path, "PNG", compress_level=compress_level)
+            print(f"    Saved: {out_path}")
+
+        entries[out_path.name] = {"key": key, "animations": anim_meta}
         all_metadata["directions"][direction] = {
             "sheet": str(out_path.relative_to(output_dir.parent.parent)),
             "animations": anim_meta,
         }
 
-    return all_metadata
+    return all_metadata, entries
+
+
+type SheetJob = Callable[
+    [Path, Path, int, SheetCache | None], tuple[dict[str, object], SheetCache]
+]
+
+
+def run_sheet_job(
+    job: SheetJob,
+    src_dir: Path,
+    output_dir: Path,
+    compress_level: int,
+    sheet_cache: SheetCache | None,
+) -> tuple[dict[str, object], SheetCache, str]:
+    """Run process_character/process_enemy in a worker, capturing its log.
 
+    Workers run concurrently, so their progress lines are returned instead of
+    printed and main prints each log whole, in submission order.
+    """
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        metadata, entries = job(src_dir, output_dir, compress_level, sheet_cache)
+    return metadata, entries, log.getvalue()
 
-def main() -> None:
+
+def main(argv: list[str]) -> None:
     """Process all characters and enemies, generate sprite sheets."""
+    parser = argparse.ArgumentParser(description="Combine PixelLab frames into sprite sheets.")
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help=(
+            f"Save PNGs at zlib level {PNG_FAST_COMPRESS_LEVEL} instead of "
+            f"{PNG_COMPRESS_LEVEL} (faster encode, larger files; for local iteration)"
+        ),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=f"Rebuild every sheet, ignoring the {SHEET_CACHE_NAME} input cache",
+    )
+    args = parser.parse_args(argv)
+    compress_level = PNG_FAST_COMPRESS_LEVEL if args.fast else PNG_COMPRESS_LEVEL
+
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     pixellab_dir = project_root / "assets" / "sprites" / "pixellab"
@@ -284,22 +466,77 @@ def main() -> None:
     output_dir.mkdir(exist_ok=True)
 
     all_metadata: dict[str, object] = {}
+    sheet_cache: SheetCache = {} if args.force else load_sheet_cache(output_dir)
+    next_cache: SheetCache = {}
 
     # Process each hero character (top-level dirs with animations/)
     skip_dirs = {"sheets", "enemies", "objects", "tilesets"}
-    for char_dir in sorted(pixellab_dir.iterdir()):
-        if char_dir.is_dir() and char_dir.name not in skip_dirs:
-            anims_dir = char_dir / "animations"
-            if anims_dir.exists():
-                all_metadata[char_dir.name] = process_character(char_dir, output_dir)
+    hero_dirs = [
+        char_dir
+        for char_dir in sorted(pixellab_dir.iterdir())
+        if char_dir.is_dir()
+        and char_dir.name not in skip_dirs
+        and (char_dir / "animations").exists()
+    ]
 
     # Process enemies from enemies/ subdirectory
     enemies_dir = pixellab_dir / "enemies"
-    if enemies_dir.exists():
-        print("\n--- Processing Enemies ---")
-        for enemy_dir in sorted(enemies_dir.iterdir()):
-            if enemy_dir.is_dir() and enemy_dir.name in ENEMY_ANIM_ORDER:
-                all_metadata[enemy_dir.name] = process_enemy(enemy_dir, output_dir)
+    enemy_dirs = (
+        [
+            enemy_dir
+            for enemy_dir in sorted(enemies_dir.iterdir())
+            if enemy_dir.is_dir() and enemy_dir.name in ENEMY_ANIM_ORDER
+        ]
+        if enemies_dir.exists()
+        else []
+    )
+
+    # Every character/enemy is independent and PNG encoding is CPU-bound, so
+    # build them in worker processes. Results (and logs) are collected in
+    # submission order to keep metadata.json and the output stable.
+    with ProcessPoolExecutor() as ex:
+        hero_jobs = [
+            (
+                char_dir.name,
+                ex.submit(
+                    run_sheet_job,
+                    process_character,
+                    char_dir,
+                    output_dir,
+                    compress_level,
+                    sheet_cache,
+                ),
+            )
+            for char_dir in hero_dirs
+        ]
+        enemy_jobs = [
+            (
+                enemy_dir.name,
+                ex.submit(
+                    run_sheet_job,
+                    process_enemy,
+                    enemy_dir,
+                    output_dir,
+                    compress_level,
+                    sheet_cache,
+                ),
+            )
+            for enemy_dir in enemy_dirs
+        ]
+
+        for name, job in hero_jobs:
+            all_metadata[name], entries, log = job.result()
+            next_cache.update(entries)
+            print(log, end="")
+
+        if enemies_dir.exists():
+            print("\n--- Processing Enemies ---")
+        for name, job in enemy_jobs:
+            all_metadata[name], entries, log = job.result()
+            next_cache.update(entries)
+            print(log, end="")
+
+    (output_dir / SHEET_CACHE_NAME).write_text(json.dumps(next_cache, indent=2))
 
     # Save combined metadata
     meta_path = output_dir / "metadata.json"
@@ -349,4 +586,4 @@ fps = 12.0
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
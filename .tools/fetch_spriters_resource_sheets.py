@@ -2,17 +2,18 @@
 #
 # /// script
 # requires-python = ">=3.14"
-# dependencies = []
+# dependencies = ["urllib3"]
 # ///
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import shutil
 import sys
 from pathlib import Path
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+
+import urllib3
 
 
 SHEETS: dict[str, str] = {
@@ -21,6 +22,17 @@ SHEETS: dict[str, str] = {
     "font": "https://www.spriters-resource.com/media/assets/134/137131.png?updated=1755481029",
 }
 
+# One pool for the single sheet host, carrying the User-Agent and keeping at
+# most one idle connection per sheet. Downloads all start at once, one per
+# asyncio.to_thread worker, so each opens its own connection; a connection is
+# only reused when more downloads are pending than the default executor has
+# worker threads, which the current SHEETS never reach.
+_POOL = urllib3.PoolManager(
+    num_pools=1,
+    maxsize=len(SHEETS),
+    headers={"User-Agent": "sdl3-sandbox (uv script)"},
+)
+
 
 def default_out_dir() -> Path:
     repo_root = Path(__file__).resolve().parents[1]
@@ -28,11 +40,17 @@ def default_out_dir() -> Path:
 
 
 def download(url: str, dest: Path) -> None:
-    req = Request(url, headers={"User-Agent": "sdl3-sandbox (uv script)"})
-    with urlopen(req) as resp:
+    resp = _POOL.request("GET", url, preload_content=False)
+    try:
+        if resp.status >= 400:
+            # Discard the unread error body so the connection can be reused.
+            resp.drain_conn()
+            raise urllib3.exceptions.HTTPError(f"HTTP Error {resp.status}: {resp.reason}")
         dest.parent.mkdir(parents=True, exist_ok=True)
         with dest.open("wb") as f:
             shutil.copyfileobj(resp, f)
+    finally:
+        resp.release_conn()
 
 
 def main(argv: list[str]) -> int:
@@ -47,23 +65,34 @@ def main(argv: list[str]) -> int:
 
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    pending: list[tuple[str, Path]] = []
     for name in names:
-        url = SHEETS[name]
         dest = out_dir / f"{name}_sheet.png"
 
         if dest.exists() and not args.overwrite:
             print(f"Skip (exists): {dest}")
             continue
 
-        try:
-            download(url, dest)
-        except (HTTPError, URLError) as e:
-            print(f"Failed: {name} ({url}) -> {dest}\n  {e}", file=sys.stderr)
-            return 1
-
-        print(f"Wrote: {dest}")
-
-    return 0
+        pending.append((name, dest))
+
+    # Downloads are independent and I/O-bound; run them side by side.
+    async def _run() -> list[BaseException | None]:
+        return await asyncio.gather(
+            *(asyncio.to_thread(download, SHEETS[name], dest) for name, dest in pending),
+            return_exceptions=True,
+        )
+
+    status = 0
+    for (name, dest), err in zip(pending, asyncio.run(_run()), strict=True):
+        if isinstance(err, urllib3.exceptions.HTTPError):
+            print(f"Failed: {name} ({SHEETS[name]}) -> {dest}\n  {err}", file=sys.stderr)
+            status = 1
+        elif err is not None:
+            raise err
+        else:
+            print(f"Wrote: {dest}")
+
+    return status
 
 
 if __name__ == "__main__":
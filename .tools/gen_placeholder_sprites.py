@@ -2,146 +2,170 @@
 #
 # /// script
 # requires-python = ">=3.14"
-# dependencies = []
+# dependencies = ["numpy"]
 # ///
 
 from __future__ import annotations
 
 import os
 import struct
-from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import cache
 
+import numpy as np
+import numpy.typing as npt
 
-type RGB = tuple[int, int, int]
 
+type RGB = tuple[int, int, int]
+type Pixels = npt.NDArray[np.uint8]  # (h, w, 3) RGB, top-down rows
 
-def clamp8(v: int) -> int:
-    return max(0, min(255, int(v)))
+# BITMAPFILEHEADER (14 bytes) + BITMAPINFOHEADER (40 bytes)
+BMP_HEADER = struct.Struct("<2sIHHIIiiHHIIiiII")
 
 
-def write_bmp(path: str, width: int, height: int, pixels: Iterable[RGB]) -> None:
+def write_bmp(path: str, pixels: Pixels) -> None:
     # 24-bit BMP, bottom-up rows, BGR order, row padded to 4 bytes.
+    height, width, _ = pixels.shape
     row_stride = width * 3
     pad = (4 - (row_stride % 4)) % 4
     data_size = (row_stride + pad) * height
-    file_size = 14 + 40 + data_size
+    file_size = BMP_HEADER.size + data_size
 
-    with open(path, "wb") as f:
+    header = BMP_HEADER.pack(
         # BITMAPFILEHEADER
-        f.write(b"BM")
-        f.write(struct.pack("<I", file_size))
-        f.write(struct.pack("<HH", 0, 0))
-        f.write(struct.pack("<I", 14 + 40))
-
+        b"BM",
+        file_size,
+        0,
+        0,
+        BMP_HEADER.size,  # pixel data offset
         # BITMAPINFOHEADER
-        f.write(struct.pack("<I", 40))  # header size
-        f.write(struct.pack("<i", width))
-        f.write(struct.pack("<i", height))
-        f.write(struct.pack("<H", 1))  # planes
-        f.write(struct.pack("<H", 24))  # bpp
-        f.write(struct.pack("<I", 0))  # compression (BI_RGB)
-        f.write(struct.pack("<I", data_size))
-        f.write(struct.pack("<i", 2835))  # x ppm (72 DPI)
-        f.write(struct.pack("<i", 2835))  # y ppm
-        f.write(struct.pack("<I", 0))  # colors used
-        f.write(struct.pack("<I", 0))  # important colors
-
-        # Pixel data: pixels is top-down; BMP stores bottom-up.
-        pix = list(pixels)
-        assert len(pix) == width * height
-
-        for y in range(height - 1, -1, -1):
-            base = y * width
-            for x in range(width):
-                r, g, b = pix[base + x]
-                f.write(bytes((clamp8(b), clamp8(g), clamp8(r))))
-            if pad:
-                f.write(b"\x00" * pad)
-
-
-def set_px(buf: list[RGB], w: int, x: int, y: int, c: RGB) -> None:
-    if x < 0 or y < 0 or x >= w:
-        return
-    buf[y * w + x] = c
+        40,  # header size
+        width,
+        height,
+        1,  # planes
+        24,  # bpp
+        0,  # compression (BI_RGB)
+        data_size,
+        2835,  # x ppm (72 DPI)
+        2835,  # y ppm
+        0,  # colors used
+        0,  # important colors
+    )
+
+    # Pixel data: pixels is top-down; BMP stores bottom-up.
+    rows = pixels[::-1, :, ::-1].reshape(height, row_stride)
+    if pad:
+        rows = np.pad(rows, ((0, 0), (0, pad)))
 
+    with open(path, "wb") as f:
+        f.write(header + rows.tobytes())
 
-def fill_rect(buf: list[RGB], w: int, x0: int, y0: int, x1: int, y1: int, c: RGB) -> None:
-    for y in range(y0, y1):
-        for x in range(x0, x1):
-            set_px(buf, w, x, y, c)
 
+def set_px(buf: Pixels, x: int, y: int, c: RGB) -> None:
+    h, w, _ = buf.shape
+    if x < 0 or y < 0 or x >= w or y >= h:
+        return
+    buf[y, x] = c
 
-def outline_rect(buf: list[RGB], w: int, x0: int, y0: int, x1: int, y1: int, c: RGB) -> None:
-    for x in range(x0, x1):
-        set_px(buf, w, x, y0, c)
-        set_px(buf, w, x, y1 - 1, c)
-    for y in range(y0, y1):
-        set_px(buf, w, x0, y, c)
-        set_px(buf, w, x1 - 1, y, c)
 
+def fill_rect(buf: Pixels, x0: int, y0: int, x1: int, y1: int, c: RGB) -> None:
+    # Clamp the low edges so negative coords clip instead of wrapping around.
+    buf[max(0, y0) : max(0, y1), max(0, x0) : max(0, x1)] = c
 
-def draw_simple_actor(buf: list[RGB], sheet_w: int, fx: int, fy: int, color: RGB, variant: int) -> None:
-    # Frame is 32x32, origin is top-left of frame.
-    x0 = fx
-    y0 = fy
 
-    bg = (255, 0, 255)  # colorkey magenta
-    outline = (12, 12, 12)
-    accent = (min(255, color[0] + 40), min(255, color[1] + 40), min(255, color[2] + 40))
+def outline_rect(buf: Pixels, x0: int, y0: int, x1: int, y1: int, c: RGB) -> None:
+    fill_rect(buf, x0, y0, x1, y0 + 1, c)
+    fill_rect(buf, x0, y1 - 1, x1, y1, c)
+    fill_rect(buf, x0, y0, x0 + 1, y1, c)
+    fill_rect(buf, x1 - 1, y0, x1, y1, c)
+
 
-    fill_rect(buf, sheet_w, x0, y0, x0 + 32, y0 + 32, bg)
+@cache
+def actor_masks(variant: int) -> tuple[npt.NDArray[np.bool_], ...]:
+    # The actor layout is fixed per variant; only the colors change. Draw it
+    # once with sentinel colors and keep one 32x32 mask per color role:
+    # (bg, body, accent, outline).
+    shape: Pixels = np.zeros((32, 32, 3), dtype=np.uint8)
+    bg, body, accent, outline = (0, 0, 0), (1, 0, 0), (2, 0, 0), (3, 0, 0)
 
     # head + body
-    fill_rect(buf, sheet_w, x0 + 12, y0 + 6, x0 + 20, y0 + 12, accent)
-    fill_rect(buf, sheet_w, x0 + 11, y0 + 12, x0 + 21, y0 + 24, color)
-    outline_rect(buf, sheet_w, x0 + 11, y0 + 6, x0 + 21, y0 + 24, outline)
+    fill_rect(shape, 12, 6, 20, 12, accent)
+    fill_rect(shape, 11, 12, 21, 24, body)
+    outline_rect(shape, 11, 6, 21, 24, outline)
 
     # legs (variant animates the pose)
     if variant == 0:
-        fill_rect(buf, sheet_w, x0 + 12, y0 + 24, x0 + 15, y0 + 30, accent)
-        fill_rect(buf, sheet_w, x0 + 17, y0 + 24, x0 + 20, y0 + 30, accent)
+        fill_rect(shape, 12, 24, 15, 30, accent)
+        fill_rect(shape, 17, 24, 20, 30, accent)
     elif variant == 1:
-        fill_rect(buf, sheet_w, x0 + 11, y0 + 24, x0 + 14, y0 + 30, accent)
-        fill_rect(buf, sheet_w, x0 + 18, y0 + 25, x0 + 21, y0 + 30, accent)
+        fill_rect(shape, 11, 24, 14, 30, accent)
+        fill_rect(shape, 18, 25, 21, 30, accent)
     elif variant == 2:
-        fill_rect(buf, sheet_w, x0 + 12, y0 + 25, x0 + 15, y0 + 30, accent)
-        fill_rect(buf, sheet_w, x0 + 17, y0 + 24, x0 + 20, y0 + 30, accent)
+        fill_rect(shape, 12, 25, 15, 30, accent)
+        fill_rect(shape, 17, 24, 20, 30, accent)
     else:
-        fill_rect(buf, sheet_w, x0 + 11, y0 + 25, x0 + 14, y0 + 30, accent)
-        fill_rect(buf, sheet_w, x0 + 18, y0 + 24, x0 + 21, y0 + 30, accent)
+        fill_rect(shape, 11, 25, 14, 30, accent)
+        fill_rect(shape, 18, 24, 21, 30, accent)
 
     # tiny eyes
-    set_px(buf, sheet_w, x0 + 14, y0 + 8, outline)
-    set_px(buf, sheet_w, x0 + 17, y0 + 8, outline)
+    set_px(shape, 14, 8, outline)
+    set_px(shape, 17, 8, outline)
+
+    masks = tuple(shape[:, :, 0] == role[0] for role in (bg, body, accent, outline))
+    for mask in masks:
+        mask.flags.writeable = False
+    return masks
 
 
-def draw_dash_effect(buf: list[RGB], sheet_w: int, fx: int, fy: int, color: RGB) -> None:
+def draw_simple_actor(buf: Pixels, fx: int, fy: int, color: RGB, variant: int) -> None:
+    # Frame is 32x32, origin is top-left of frame.
+    bg = (255, 0, 255)  # colorkey magenta
+    outline = (12, 12, 12)
+    accent = (min(255, color[0] + 40), min(255, color[1] + 40), min(255, color[2] + 40))
+
+    frame = buf[fy : fy + 32, fx : fx + 32]
+    for mask, c in zip(actor_masks(variant), (bg, color, accent, outline), strict=True):
+        frame[mask] = c
+
+
+def draw_dash_effect(buf: Pixels, fx: int, fy: int, color: RGB) -> None:
     # trailing lines behind the actor
     dash = (min(255, color[0] + 50), min(255, color[1] + 50), min(255, color[2] + 50))
-    for i in range(6):
-        fill_rect(buf, sheet_w, fx + 2, fy + 14 + i, fx + 10, fy + 15 + i, dash)
+    fill_rect(buf, fx + 2, fy + 14, fx + 10, fy + 20, dash)
 
 
-def draw_glide_wings(buf: list[RGB], sheet_w: int, fx: int, fy: int, color: RGB) -> None:
+def draw_glide_wings(buf: Pixels, fx: int, fy: int, color: RGB) -> None:
     wing = (min(255, color[0] + 60), min(255, color[1] + 60), min(255, color[2] + 60))
-    fill_rect(buf, sheet_w, fx + 6, fy + 14, fx + 11, fy + 18, wing)
-    fill_rect(buf, sheet_w, fx + 21, fy + 14, fx + 26, fy + 18, wing)
+    fill_rect(buf, fx + 6, fy + 14, fx + 11, fy + 18, wing)
+    fill_rect(buf, fx + 21, fy + 14, fx + 26, fy + 18, wing)
 
 
-def draw_spindash_ball(buf: list[RGB], sheet_w: int, fx: int, fy: int, color: RGB, phase: int) -> None:
+@cache
+def disc_mask(r: int) -> npt.NDArray[np.bool_]:
+    # (2r+1)^2 mask of a filled circle; the spindash only alternates two radii.
+    yy, xx = np.ogrid[-r : r + 1, -r : r + 1]
+    mask: npt.NDArray[np.bool_] = xx * xx + yy * yy <= r * r
+    mask.flags.writeable = False
+    return mask
+
+
+def draw_spindash_ball(buf: Pixels, fx: int, fy: int, color: RGB, phase: int) -> None:
     bg = (255, 0, 255)
     outline = (12, 12, 12)
-    fill_rect(buf, sheet_w, fx, fy, fx + 32, fy + 32, bg)
+    fill_rect(buf, fx, fy, fx + 32, fy + 32, bg)
 
     cx = fx + 16
     cy = fy + 18
     r = 9 + (phase % 2)
-    for y in range(-r, r + 1):
-        for x in range(-r, r + 1):
-            if x * x + y * y <= r * r:
-                set_px(buf, sheet_w, cx + x, cy + y, color)
-    outline_rect(buf, sheet_w, cx - r, cy - r, cx + r + 1, cy + r + 1, outline)
+    buf[cy - r : cy + r + 1, cx - r : cx + r + 1][disc_mask(r)] = color
+    outline_rect(buf, cx - r, cy - r, cx + r + 1, cy + r + 1, outline)
+
+
+def repeat_first_frame(buf: Pixels, fy: int, frame_w: int, frame_h: int) -> None:
+    # For rows whose frames are all identical: copy frame 0 across the row.
+    row = buf[fy : fy + frame_h]
+    cols = buf.shape[1] // frame_w
+    row[:, frame_w : cols * frame_w] = np.tile(row[:, :frame_w], (1, cols - 1, 1))
 
 
 @dataclass(frozen=True)
@@ -160,44 +184,41 @@ def generate_sheet(path: str, spec: CharacterSheetSpec) -> None:
     h = frame_h * rows
 
     bg = (255, 0, 255)
-    pixels: list[RGB] = [bg] * (w * h)
+    pixels: Pixels = np.full((h, w, 3), bg, dtype=np.uint8)
 
     # Row 0: idle (use frame 0)
-    draw_simple_actor(pixels, w, 0 * frame_w, 0 * frame_h, spec.color, 0)
-    for c in range(1, cols):
-        draw_simple_actor(pixels, w, c * frame_w, 0 * frame_h, spec.color, 0)
+    draw_simple_actor(pixels, 0 * frame_w, 0 * frame_h, spec.color, 0)
+    repeat_first_frame(pixels, 0 * frame_h, frame_w, frame_h)
 
     # Row 1: run (4 frames)
     for c in range(cols):
-        draw_simple_actor(pixels, w, c * frame_w, 1 * frame_h, spec.color, c)
+        draw_simple_actor(pixels, c * frame_w, 1 * frame_h, spec.color, c)
 
     # Row 2: jump
-    draw_simple_actor(pixels, w, 0 * frame_w, 2 * frame_h, spec.color, 2)
-    for c in range(1, cols):
-        draw_simple_actor(pixels, w, c * frame_w, 2 * frame_h, spec.color, 2)
+    draw_simple_actor(pixels, 0 * frame_w, 2 * frame_h, spec.color, 2)
+    repeat_first_frame(pixels, 2 * frame_h, frame_w, frame_h)
 
     # Row 3: fall
-    draw_simple_actor(pixels, w, 0 * frame_w, 3 * frame_h, spec.color, 3)
-    for c in range(1, cols):
-        draw_simple_actor(pixels, w, c * frame_w, 3 * frame_h, spec.color, 3)
+    draw_simple_actor(pixels, 0 * frame_w, 3 * frame_h, spec.color, 3)
+    repeat_first_frame(pixels, 3 * frame_h, frame_w, frame_h)
 
     # Row 4: dash
-    for c in range(cols):
-        draw_simple_actor(pixels, w, c * frame_w, 4 * frame_h, spec.color, 1)
-        if spec.dash_effect:
-            draw_dash_effect(pixels, w, c * frame_w, 4 * frame_h, spec.color)
+    draw_simple_actor(pixels, 0 * frame_w, 4 * frame_h, spec.color, 1)
+    if spec.dash_effect:
+        draw_dash_effect(pixels, 0 * frame_w, 4 * frame_h, spec.color)
+    repeat_first_frame(pixels, 4 * frame_h, frame_w, frame_h)
 
     # Row 5: glide
-    for c in range(cols):
-        draw_simple_actor(pixels, w, c * frame_w, 5 * frame_h, spec.color, 0)
-        draw_glide_wings(pixels, w, c * frame_w, 5 * frame_h, spec.color)
+    draw_simple_actor(pixels, 0 * frame_w, 5 * frame_h, spec.color, 0)
+    draw_glide_wings(pixels, 0 * frame_w, 5 * frame_h, spec.color)
+    repeat_first_frame(pixels, 5 * frame_h, frame_w, frame_h)
 
     # Row 6: spindash charge
     for c in range(cols):
-        draw_spindash_ball(pixels, w, c * frame_w, 6 * frame_h, spec.color, c)
+        draw_spindash_ball(pixels, c * frame_w, 6 * frame_h, spec.color, c)
 
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    write_bmp(path, w, h, pixels)
+    write_bmp(path, pixels)
 
 
 def main() -> int: